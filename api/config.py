@@ -3,14 +3,21 @@ Configuration management for Sanctions Screening API
 Centralized configuration with environment variable support
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
-from pydantic_settings import BaseSettings
+from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings with validation"""
     
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True
+    )
+    
     # API Configuration
     API_TITLE: str = "Sanctions Screening API"
     API_VERSION: str = "1.0.0"
@@ -21,6 +28,11 @@ class Settings(BaseSettings):
     YENTE_BASE_URL: str = "http://127.0.0.1:5000"
     YENTE_TIMEOUT: int = 15  # seconds
     YENTE_CONNECT_TIMEOUT: int = 5  # seconds
+    YENTE_HEALTH_CHECK_INTERVAL: float = 5.0  # seconds between background health probes
+    
+    # Yente Result Cache (identical queries within the TTL skip the round-trip)
+    YENTE_CACHE_MAXSIZE: int = 10_000  # cached (dataset, query) entries
+    YENTE_CACHE_TTL: int = 300  # seconds; datasets change slowly, 0 disables
     
     # Dataset Configuration
     DATASETS: List[str] = ["us_ofac_sdn", "un_sc_sanctions"]
@@ -33,25 +45,37 @@ class Settings(BaseSettings):
     
     # Response Configuration
     MAX_MATCHES_RETURNED: int = 10    # Top N matches to return
+    MAX_BATCH_SIZE: int = 100         # Max people per batch screening request
     
     # Audit Logging Configuration
     LOG_BASE_DIR: str = "C:\\SANCTIONS-CHECK\\logs\\api"
-    LOG_RETENTION_DAYS: int = 90
-    LOG_MAX_SIZE_MB: int = 100
+    LOG_RETENTION_DAYS: int = 90      # Daily audit files kept after midnight rollover
+    LOG_MAX_SIZE_MB: int = 100        # Unused (rotation is daily); kept so existing .env files load
+    LOG_BATCH_MAX_LINES: int = 256    # Audit lines buffered before a forced write
+    LOG_BATCH_INTERVAL_MS: int = 50   # Max time an audit line waits in the buffer
     
     # Data Paths (for reference, not used by API directly)
     DATA_BASE_DIR: str = "D:\\Sanctions-data"
     OFAC_DATA_PATH: str = "D:\\Sanctions-data\\datasets\\raw\\ofac"
     UN_DATA_PATH: str = "D:\\Sanctions-data\\datasets\\raw\\un"
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings (.env is parsed only once)"""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
+
+# Decision thresholds reported in every screening response (static per process;
+# treat as read-only)
+THRESHOLDS_SNAPSHOT = {
+    "info": settings.THRESHOLD_INFO,
+    "review": settings.THRESHOLD_REVIEW,
+    "block": settings.THRESHOLD_BLOCK
+}
 
 
 def ensure_directories():
@@ -65,5 +89,12 @@ def ensure_directories():
     return audit_dir
 
 
-# Initialize directories on import
-AUDIT_LOG_DIR = ensure_directories()
\ No newline at end of file
+_audit_log_dir: Optional[Path] = None
+
+
+def get_audit_log_dir() -> Path:
+    """Return the audit log directory, creating it on first use (not at import)"""
+    global _audit_log_dir
+    if _audit_log_dir is None:
+        _audit_log_dir = ensure_directories()
+    return _audit_log_dir
@@ -2,37 +2,70 @@
 Sanctions Screening API
 FastAPI application for PEP and sanctions screening
 """
-import uuid
-from datetime import datetime
+import asyncio
+import heapq
+import operator
+import secrets
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
+import orjson
 from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from config import settings
+from config import settings, get_audit_log_dir, THRESHOLDS_SNAPSHOT
 from models import (
     PersonScreeningRequest,
     ScreeningResponse,
+    BatchScreeningRequest,
+    BatchScreeningResponse,
+    BatchScreeningError,
     HealthCheckResponse
 )
-from services.yente_client import yente_client
-from services.decision_engine import decision_engine
-from utils.audit_logger import audit_logger
 
 
-# Initialize FastAPI app
-app = FastAPI(
-    title=settings.API_TITLE,
-    version=settings.API_VERSION,
-    description="Sanctions screening API for i-betting platform compliance",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
+class UTCZResponse(ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes as "...Z", the same format pydantic emits"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup checks"""
+# Service singletons are imported on first use so that importing this module
+# (uvicorn reload parent, worker fork, tooling) does not pull in httpx and the
+# audit log handlers.
+@lru_cache
+def get_yente_client():
+    """Return the shared Yente client"""
+    from services.yente_client import yente_client
+    return yente_client
+
+
+@lru_cache
+def get_decision_engine():
+    """Return the shared decision engine"""
+    from services.decision_engine import decision_engine
+    return decision_engine
+
+
+@lru_cache
+def get_audit_logger():
+    """Return the shared audit logger"""
+    from utils.audit_logger import audit_logger
+    return audit_logger
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup checks and shutdown cleanup"""
+    yente_client = get_yente_client()
+    audit_logger = get_audit_logger()
+    
     print(f"\n{'='*60}")
     print(f"Starting {settings.API_TITLE} v{settings.API_VERSION}")
     print(f"{'='*60}")
@@ -42,13 +75,51 @@ async def startup_event():
     print(f"Audit logs: {settings.LOG_BASE_DIR}")
     print(f"{'='*60}\n")
     
-    # Check Yente connectivity
-    is_healthy, message = await yente_client.check_health()
+    # Make sure the audit log directories exist before serving requests
+    get_audit_log_dir()
+    
+    # Audit writer thread (already running unless a previous shutdown stopped it)
+    audit_logger.start()
+    
+    # Yente connection pool (reopened if a previous shutdown closed it)
+    yente_client.open()
+    
+    # Check Yente connectivity (also seeds the cached health state)
+    is_healthy, message = await yente_client.is_healthy()
     if not is_healthy:
         print(f"WARNING: Yente health check failed: {message}")
         print("API will start but screening requests will fail until Yente is available.\n")
     else:
         print(f"Yente status: {message}\n")
+    
+    # Keep Yente health fresh off the request path
+    health_task = asyncio.create_task(yente_client.run_health_monitor())
+    
+    yield
+    
+    health_task.cancel()
+    try:
+        await health_task
+    except asyncio.CancelledError:
+        pass
+    
+    # Release pooled Yente connections
+    await yente_client.close()
+    
+    # Drain pending audit records to disk
+    audit_logger.stop()
+
+
+# Initialize FastAPI app
+app = FastAPI(
+    title=settings.API_TITLE,
+    version=settings.API_VERSION,
+    description="Sanctions screening API for i-betting platform compliance",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    default_response_class=UTCZResponse,
+    lifespan=lifespan
+)
 
 
 @app.get("/")
@@ -61,6 +132,7 @@ async def root():
         "endpoints": {
             "health": "/health",
             "screen_person": "POST /v1/sanctions/screen/person",
+            "screen_person_batch": "POST /v1/sanctions/screen/person/batch",
             "docs": "/docs"
         }
     }
@@ -72,19 +144,25 @@ async def health_check():
     Health check endpoint
     Verifies API and Yente service availability
     """
-    yente_healthy, yente_message = await yente_client.check_health()
+    yente_client = get_yente_client()
+    
+    # Probe now and refresh the cached state the screening path relies on
+    yente_healthy, yente_message = await yente_client.refresh_health()
     
     return HealthCheckResponse(
         status="healthy" if yente_healthy else "degraded",
         yente_status=yente_message,
         datasets_available=settings.DATASETS,
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
 
 
+# response_model=None skips FastAPI's second validation pass over the response;
+# the model is still documented in OpenAPI via `responses`
 @app.post(
     "/v1/sanctions/screen/person",
-    response_model=ScreeningResponse,
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": ScreeningResponse}},
     status_code=status.HTTP_200_OK
 )
 async def screen_person(request: PersonScreeningRequest):
@@ -109,21 +187,93 @@ async def screen_person(request: PersonScreeningRequest):
     - REVIEW: Possible match, manual review required, soft hold
     - BLOCK: High confidence match, hard hold, compliance escalation
     """
-    
     # Generate request ID if not provided
-    request_id = request.request_id or str(uuid.uuid4())
+    request_id = request.request_id or secrets.token_hex(16)
+    
+    response = await _screen_one(request, request_id)
+    return UTCZResponse(response.model_dump())
+
+
+@app.post(
+    "/v1/sanctions/screen/person/batch",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": BatchScreeningResponse}},
+    status_code=status.HTTP_200_OK
+)
+async def screen_person_batch(batch: BatchScreeningRequest):
+    """
+    Screen several people in one call
+    
+    Each person goes through the same pipeline as POST /v1/sanctions/screen/person,
+    with its own request ID and audit trail. Screenings run concurrently, so the
+    call takes about as long as the slowest one instead of the sum.
+    
+    Results are returned in request order. A person whose screening fails
+    (e.g. Yente unavailable) gets an error entry with the status code and detail
+    the single-person endpoint would have returned; the other results are still
+    delivered, so every audited decision reaches the caller.
+    """
+    if len(batch.requests) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch of {len(batch.requests)} exceeds MAX_BATCH_SIZE={settings.MAX_BATCH_SIZE}"
+        )
+    
+    request_ids = [request.request_id or secrets.token_hex(16) for request in batch.requests]
+    
+    outcomes = await asyncio.gather(
+        *[
+            _screen_one(request, request_id)
+            for request, request_id in zip(batch.requests, request_ids)
+        ],
+        return_exceptions=True
+    )
+    
+    results = []
+    for request_id, outcome in zip(request_ids, outcomes):
+        if isinstance(outcome, ScreeningResponse):
+            results.append(outcome.model_dump())
+        elif isinstance(outcome, HTTPException):
+            results.append(BatchScreeningError(
+                request_id=request_id,
+                status_code=outcome.status_code,
+                detail=outcome.detail
+            ).model_dump())
+        elif isinstance(outcome, Exception):
+            # _screen_one maps failures to HTTPException; this is a safety net
+            results.append(BatchScreeningError(
+                request_id=request_id,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Internal screening error: {str(outcome)}"
+            ).model_dump())
+        else:
+            # Cancellation and other BaseExceptions are not per-item errors
+            raise outcome
+    
+    return UTCZResponse({"results": results})
+
+
+async def _screen_one(request: PersonScreeningRequest, request_id: str) -> ScreeningResponse:
+    """Run the full screening pipeline for one person (shared by single and batch routes)"""
+    yente_client = get_yente_client()
+    decision_engine = get_decision_engine()
+    audit_logger = get_audit_logger()
     
     # Log incoming request
     audit_logger.log_screening_request(
         request_id=request_id,
-        request_data=request.model_dump(),
+        full_name=request.full_name,
+        country=request.country,
+        has_dob=bool(request.date_of_birth),
+        has_passport=bool(request.passport_number),
+        has_national_id=bool(request.national_id),
         user_id=request.user_id,
         context=request.transaction_context
     )
     
     try:
-        # Check Yente availability
-        yente_healthy, yente_message = await yente_client.check_health()
+        # Check Yente availability (cached, refreshed in the background)
+        yente_healthy, yente_message = await yente_client.is_healthy()
         if not yente_healthy:
             audit_logger.log_error(
                 request_id=request_id,
@@ -136,26 +286,39 @@ async def screen_person(request: PersonScreeningRequest):
             )
         
         # Screen against all datasets
-        all_matches = await yente_client.screen_all_datasets(
+        all_matches, failed_datasets = await yente_client.screen_all_datasets(
             request=request,
             request_id=request_id
         )
         
+        # Never decide on partial results: a missing dataset would read as "clear"
+        if failed_datasets:
+            error_message = f"Yente query failed for: {', '.join(failed_datasets)}"
+            audit_logger.log_error(
+                request_id=request_id,
+                error_type="yente_unavailable",
+                error_message=error_message
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Sanctions screening service unavailable: {error_message}"
+            )
+        
         # Apply decision engine
         decision, risk_level, top_score, reasons = decision_engine.make_decision(all_matches)
         
-        # Limit matches returned (keep top N)
-        top_matches = all_matches[:settings.MAX_MATCHES_RETURNED]
+        # Limit matches returned (top N by score, without sorting the full list)
+        top_matches = heapq.nlargest(
+            settings.MAX_MATCHES_RETURNED,
+            all_matches,
+            key=operator.attrgetter("score")
+        )
         
         # Build metadata
         metadata: Dict[str, Any] = {
             "total_matches_found": len(all_matches),
             "matches_returned": len(top_matches),
-            "thresholds": {
-                "info": settings.THRESHOLD_INFO,
-                "review": settings.THRESHOLD_REVIEW,
-                "block": settings.THRESHOLD_BLOCK
-            },
+            "thresholds": THRESHOLDS_SNAPSHOT,
             "input_fields_provided": {
                 "name": True,
                 "country": bool(request.country),
@@ -180,7 +343,7 @@ async def screen_person(request: PersonScreeningRequest):
         # Build response
         response = ScreeningResponse(
             request_id=request_id,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
             decision=decision,
             risk_level=risk_level,
             top_score=top_score,
@@ -1,14 +1,17 @@
 """
 Pydantic models for API request/response validation
 """
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class PersonScreeningRequest(BaseModel):
     """Request model for person screening"""
     
+    # Whitespace stripping is handled by pydantic-core for every string field
+    model_config = ConfigDict(extra="ignore", frozen=True, str_strip_whitespace=True)
+    
     full_name: str = Field(
         ..., 
         min_length=2,
@@ -47,13 +50,8 @@ class PersonScreeningRequest(BaseModel):
     @classmethod
     def validate_country(cls, v: Optional[str]) -> Optional[str]:
         if v:
-            return v.upper().strip()
+            return v.upper()
         return v
-    
-    @field_validator('full_name')
-    @classmethod
-    def validate_name(cls, v: str) -> str:
-        return v.strip()
 
 
 class MatchedEntity(BaseModel):
@@ -76,7 +74,10 @@ class MatchedEntity(BaseModel):
 class ScreeningResponse(BaseModel):
     """Response model for screening results"""
     
-    request_id: str = Field(..., description="Unique request identifier")
+    request_id: str = Field(
+        ...,
+        description="Unique request identifier (caller-supplied, or a 32-char hex string if generated)"
+    )
     timestamp: datetime = Field(..., description="Screening timestamp (UTC)")
     
     decision: Literal["clear", "review", "block"] = Field(
@@ -115,6 +116,36 @@ class ScreeningResponse(BaseModel):
     )
 
 
+class BatchScreeningRequest(BaseModel):
+    """Request model for screening several people in one call"""
+    
+    requests: List[PersonScreeningRequest] = Field(
+        ...,
+        min_length=1,
+        description="People to screen (at most MAX_BATCH_SIZE per call)"
+    )
+
+
+class BatchScreeningError(BaseModel):
+    """Batch entry for a person whose screening failed"""
+    
+    request_id: str = Field(..., description="Request identifier of the failed screening")
+    status_code: int = Field(
+        ...,
+        description="HTTP status the single-person endpoint would have returned (e.g. 503)"
+    )
+    detail: str = Field(..., description="Error detail")
+
+
+class BatchScreeningResponse(BaseModel):
+    """Response model for batch screening results"""
+    
+    results: List[Union[ScreeningResponse, BatchScreeningError]] = Field(
+        default_factory=list,
+        description="Screening result or error per person, in the same order as the requests"
+    )
+
+
 class HealthCheckResponse(BaseModel):
     """Health check response"""
     status: str
@@ -2,7 +2,7 @@
 Decision engine for sanctions screening
 Applies intelligent rules and thresholds to determine risk and action
 """
-from typing import List, Literal, Tuple
+from typing import List, Literal, Set, Tuple
 from models import MatchedEntity
 from config import settings
 
@@ -28,19 +28,8 @@ class DecisionEngine:
         self.threshold_info = settings.THRESHOLD_INFO
         self.threshold_review = settings.THRESHOLD_REVIEW
         self.threshold_block = settings.THRESHOLD_BLOCK
-    
-    def _determine_risk_level(self, score: float) -> Literal["none", "low", "medium", "high", "critical"]:
-        """Determine risk level based on score"""
-        if score >= self.threshold_block:
-            return "critical"
-        elif score >= (self.threshold_review + self.threshold_block) / 2:
-            return "high"
-        elif score >= self.threshold_review:
-            return "medium"
-        elif score >= self.threshold_info:
-            return "low"
-        else:
-            return "none"
+        # HIGH risk starts halfway between the review and block thresholds
+        self.threshold_high = (self.threshold_review + self.threshold_block) / 2
     
     def _build_decision_reasons(
         self,
@@ -121,9 +110,9 @@ class DecisionEngine:
     
     def _apply_enhanced_rules(
         self,
-        matches: List[MatchedEntity],
         base_decision: str,
-        top_score: float
+        medium_confidence_count: int,
+        datasets_with_hits: Set[str]
     ) -> Tuple[str, List[str]]:
         """
         Apply enhanced decision rules beyond simple score thresholds
@@ -133,25 +122,19 @@ class DecisionEngine:
         2. Multiple high-scoring matches increase severity
         3. DOB + Name match increases confidence
         
+        The match statistics are precomputed by make_decision in a single pass.
+        
         Returns:
             (decision, additional_reasons)
         """
         enhanced_reasons = []
         decision = base_decision
         
-        # Rule 1: Check for exact ID matches (very strong signal)
-        for match in matches:
-            if match.score >= self.threshold_review:
-                # This is a simplified check - in production you'd compare actual IDs
-                # from the request against entity properties
-                pass
+        # Rule 1: Exact ID matches (very strong signal)
+        # Simplified - in production you'd compare actual IDs from the request
+        # against entity properties of matches above the review threshold
         
         # Rule 2: Multiple medium-confidence matches
-        medium_confidence_count = sum(
-            1 for m in matches 
-            if self.threshold_review <= m.score < self.threshold_block
-        )
-        
         if medium_confidence_count >= 3 and decision == "review":
             enhanced_reasons.append(
                 f"Enhanced scrutiny: {medium_confidence_count} matches above review threshold. "
@@ -159,8 +142,6 @@ class DecisionEngine:
             )
         
         # Rule 3: Dataset consensus (same person in multiple datasets)
-        datasets_with_hits = set(m.dataset for m in matches if m.score >= self.threshold_review)
-        
         if len(datasets_with_hits) >= 2 and decision == "review":
             enhanced_reasons.append(
                 f"Cross-dataset confirmation: Person appears in {len(datasets_with_hits)} datasets "
@@ -176,6 +157,8 @@ class DecisionEngine:
         """
         Make final screening decision based on matches
         
+        Matches do not need to be sorted; all statistics are gathered in one pass.
+        
         Returns:
             (decision, risk_level, top_score, reasons)
         """
@@ -184,17 +167,55 @@ class DecisionEngine:
         if not matches:
             return "clear", "none", 0.0, self._build_decision_reasons("clear", 0.0, 0)
         
-        # Get top score
-        top_score = max(m.score for m in matches)
-        top_match = max(matches, key=lambda m: m.score)
+        # Bind thresholds to locals for the hot loop and comparisons below
+        ti = self.threshold_info
+        tr = self.threshold_review
+        th = self.threshold_high
+        tb = self.threshold_block
+        
+        # Single pass: top match, medium-confidence count, datasets with hits
+        top_score = -1.0
+        top_match = None
+        medium_confidence_count = 0
+        datasets_with_hits: Set[str] = set()
+        
+        remaining = iter(matches)
+        for m in remaining:
+            s = m.score
+            if s > top_score:
+                top_score = s
+                top_match = m
+            if s >= tr:
+                if s >= tb:
+                    # Decision is BLOCK from here on. Enhanced rules only add
+                    # reasons to REVIEW decisions, so the counters are no longer
+                    # needed and only the top match is tracked below.
+                    break
+                datasets_with_hits.add(m.dataset)
+                medium_confidence_count += 1
+        
+        for m in remaining:
+            if m.score > top_score:
+                top_score = m.score
+                top_match = m
         
         # Determine risk level
-        risk_level = self._determine_risk_level(top_score)
+        risk_level: Literal["none", "low", "medium", "high", "critical"]
+        if top_score >= tb:
+            risk_level = "critical"
+        elif top_score >= th:
+            risk_level = "high"
+        elif top_score >= tr:
+            risk_level = "medium"
+        elif top_score >= ti:
+            risk_level = "low"
+        else:
+            risk_level = "none"
         
         # Apply base threshold decision
-        if top_score >= self.threshold_block:
+        if top_score >= tb:
             base_decision = "block"
-        elif top_score >= self.threshold_review:
+        elif top_score >= tr:
             base_decision = "review"
         else:
             base_decision = "clear"
@@ -209,9 +230,9 @@ class DecisionEngine:
         
         # Apply enhanced rules
         final_decision, enhanced_reasons = self._apply_enhanced_rules(
-            matches,
             base_decision,
-            top_score
+            medium_confidence_count,
+            datasets_with_hits
         )
         
         # Combine reasons
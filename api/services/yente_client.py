@@ -2,15 +2,23 @@
 Yente API client for sanctions matching
 Handles all communication with the Yente service
 """
+import asyncio
+import hashlib
 import time
+from itertools import chain
 from typing import Any, Dict, List, Optional, Tuple
 import httpx
+import orjson
+from cachetools import TTLCache
 
 from config import settings
 from models import PersonScreeningRequest, MatchedEntity
 from utils.audit_logger import audit_logger
 
 
+JSON_HEADERS = {"content-type": "application/json"}
+
+
 class YenteClient:
     """Client for Yente sanctions matching service"""
     
@@ -20,17 +28,56 @@ class YenteClient:
             timeout=settings.YENTE_TIMEOUT,
             connect=settings.YENTE_CONNECT_TIMEOUT
         )
+        
+        # Shared connection pool (keep-alive + HTTP/2) reused across requests;
+        # recreated by open() if a previous shutdown closed it
+        self._client = self._create_client()
+        
+        # Cached health state, refreshed in the background by run_health_monitor()
+        self._reset_health()
+        
+        # Parsed match results keyed by (dataset, SHA-256 of the canonical query)
+        self._match_cache: TTLCache = TTLCache(
+            maxsize=settings.YENTE_CACHE_MAXSIZE,
+            ttl=settings.YENTE_CACHE_TTL
+        )
+        self._match_locks: Dict[Tuple[str, bytes], asyncio.Lock] = {}
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Build the pooled HTTP client used for all Yente calls"""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            http2=True
+        )
+    
+    def _reset_health(self):
+        """Forget any cached health state so the next check probes Yente"""
+        self._healthy = False
+        self._health_message = "Yente health not checked yet"
+        self._last_check = 0.0
+        self._health_lock = asyncio.Lock()
+    
+    def open(self):
+        """Make sure the connection pool is usable (no-op unless close() was called)"""
+        if self._client.is_closed:
+            self._client = self._create_client()
+    
+    async def close(self):
+        """Close the shared HTTP connection pool and drop the cached health state"""
+        await self._client.aclose()
+        self._reset_health()
     
     async def check_health(self) -> Tuple[bool, str]:
         """Check if Yente service is ready"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/readyz")
-                
-                if response.status_code == 200:
-                    return True, "ok"
-                else:
-                    return False, f"Yente returned status {response.status_code}"
+            response = await self._client.get("/readyz")
+            
+            if response.status_code == 200:
+                return True, "ok"
+            else:
+                return False, f"Yente returned status {response.status_code}"
         
         except httpx.TimeoutException:
             return False, "Yente service timeout"
@@ -39,6 +86,54 @@ class YenteClient:
         except Exception as e:
             return False, f"Yente health check failed: {str(e)}"
     
+    async def _refresh_health(self) -> Tuple[bool, str]:
+        """Probe Yente and update the cached health state"""
+        healthy, message = await self.check_health()
+        self._healthy = healthy
+        self._health_message = message
+        self._last_check = time.monotonic()
+        return healthy, message
+    
+    async def refresh_health(self) -> Tuple[bool, str]:
+        """Probe Yente now and update the cached health state (used by /health)"""
+        async with self._health_lock:
+            return await self._refresh_health()
+    
+    def _mark_unhealthy(self, message: str):
+        """Record a failed Yente call so the next screening re-probes instead of trusting the cache"""
+        self._healthy = False
+        self._health_message = message
+    
+    async def is_healthy(self, max_age: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        Return cached Yente health without a network round-trip when possible
+        
+        A healthy state is trusted for max_age seconds. An unhealthy or stale
+        state triggers a real probe so recovery is detected immediately.
+        """
+        if max_age is None:
+            max_age = settings.YENTE_HEALTH_CHECK_INTERVAL
+        
+        requested_at = time.monotonic()
+        if self._healthy and requested_at - self._last_check < max_age:
+            return True, self._health_message
+        
+        async with self._health_lock:
+            # Another request may have probed while we waited for the lock
+            if self._last_check >= requested_at:
+                return self._healthy, self._health_message
+            return await self._refresh_health()
+    
+    async def run_health_monitor(self, interval: Optional[float] = None):
+        """Refresh the cached health state periodically (run as a background task)"""
+        if interval is None:
+            interval = settings.YENTE_HEALTH_CHECK_INTERVAL
+        
+        while True:
+            await asyncio.sleep(interval)
+            async with self._health_lock:
+                await self._refresh_health()
+    
     def _build_yente_query(self, request: PersonScreeningRequest) -> Dict[str, Any]:
         """
         Build Yente query payload from screening request
@@ -77,163 +172,263 @@ class YenteClient:
             }
         }
     
-    def _extract_entity_properties(self, entity_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract essential properties from Yente entity response"""
-        props = entity_data.get("properties", {}) or {}
-        
-        # Extract all name variants
-        names = []
-        if "name" in props:
-            names.extend(props["name"])
-        if "alias" in props:
-            names.extend(props["alias"])
-        names = list(set(names))  # Deduplicate
-        
-        # Extract countries
-        countries = props.get("country", []) or []
-        
-        # Extract birth dates
-        birth_dates = props.get("birthDate", []) or []
+    def _extract_entity_properties(
+        self,
+        entity_data: Dict[str, Any]
+    ) -> Tuple[List[str], List[str], List[str], List[str], List[str]]:
+        """
+        Extract essential properties from Yente entity response
         
-        # Extract sanctions programs
-        programs = props.get("program", []) or []
+        Returns:
+            (names, countries, birth_dates, programs, source_urls)
+        """
+        props = entity_data.get("properties")
+        if not props:
+            return [], [], [], [], []
         
-        # Extract source URLs
-        source_urls = props.get("sourceUrl", []) or []
+        # All name variants, deduplicated in order of appearance
+        names = list(dict.fromkeys(chain(props.get("name") or (), props.get("alias") or ())))
         
-        return {
-            "names": names,
-            "countries": countries,
-            "birth_dates": birth_dates,
-            "programs": programs,
-            "source_urls": source_urls
-        }
+        return (
+            names,
+            props.get("country") or [],
+            props.get("birthDate") or [],
+            props.get("program") or [],
+            props.get("sourceUrl") or []
+        )
     
-    async def screen_against_dataset(
+    def _log_matches(self, request_id: str, dataset: str, matches: List[MatchedEntity]):
+        """Audit the match results for one dataset"""
+        if matches:
+            top_match = max(matches, key=lambda m: m.score)
+            audit_logger.log_matches_found(
+                request_id=request_id,
+                dataset=dataset,
+                match_count=len(matches),
+                top_score=top_match.score,
+                top_entity_id=top_match.entity_id
+            )
+        else:
+            audit_logger.log_matches_found(
+                request_id=request_id,
+                dataset=dataset,
+                match_count=0,
+                top_score=0.0
+            )
+    
+    async def _query_dataset(
         self,
-        request: PersonScreeningRequest,
         dataset: str,
-        request_id: str
-    ) -> List[MatchedEntity]:
+        request_id: str,
+        query_payload: Dict[str, Any],
+        query_bytes: bytes
+    ) -> Optional[List[MatchedEntity]]:
         """
-        Screen person against a specific sanctions dataset
+        Send a match query to Yente for one dataset
         
         Returns:
-            List of matched entities with scores
+            List of matched entities, or None if the query failed (already logged)
         """
-        query_payload = self._build_yente_query(request)
         matches: List[MatchedEntity] = []
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/match/{dataset}",
-                    json=query_payload
+            response = await self._client.post(
+                f"/match/{dataset}",
+                content=query_bytes,
+                headers=JSON_HEADERS
+            )
+            
+            response_time_ms = (time.perf_counter_ns() - start_time) / 1e6
+            
+            # Log the query
+            audit_logger.log_yente_query(
+                request_id=request_id,
+                dataset=dataset,
+                query_payload=query_payload,
+                response_status=response.status_code,
+                response_time_ms=response_time_ms
+            )
+            
+            if response.status_code != 200:
+                self._mark_unhealthy(f"Yente returned status {response.status_code}")
+                audit_logger.log_error(
+                    request_id=request_id,
+                    error_type="yente_api_error",
+                    error_message=f"Status {response.status_code}: {response.text}",
+                    dataset=dataset
+                )
+                return None
+            
+            # Parse response
+            data = orjson.loads(response.content)
+            results = data.get("responses", {}).get("q1", {}).get("results", []) or []
+            
+            # Convert to MatchedEntity objects
+            # Yente is a trusted local service and the types are fixed by its JSON
+            # schema, so skip per-field validation with model_construct
+            for result in results:
+                names, countries, birth_dates, programs, source_urls = (
+                    self._extract_entity_properties(result)
                 )
                 
-                response_time_ms = (time.time() - start_time) * 1000
-                
-                # Log the query
-                audit_logger.log_yente_query(
-                    request_id=request_id,
+                match_entity = MatchedEntity.model_construct(
+                    entity_id=result.get("id", ""),
                     dataset=dataset,
-                    query_payload=query_payload,
-                    response_status=response.status_code,
-                    response_time_ms=response_time_ms
+                    caption=result.get("caption", ""),
+                    score=float(result.get("score", 0.0)),
+                    match=bool(result.get("match", False)),
+                    names=names,
+                    countries=countries,
+                    birth_dates=birth_dates,
+                    programs=programs,
+                    source_urls=source_urls
                 )
-                
-                if response.status_code != 200:
-                    audit_logger.log_error(
-                        request_id=request_id,
-                        error_type="yente_api_error",
-                        error_message=f"Status {response.status_code}: {response.text}",
-                        dataset=dataset
-                    )
-                    return matches
-                
-                # Parse response
-                data = response.json()
-                results = data.get("responses", {}).get("q1", {}).get("results", []) or []
-                
-                # Convert to MatchedEntity objects
-                for result in results:
-                    entity_props = self._extract_entity_properties(result)
-                    
-                    match_entity = MatchedEntity(
-                        entity_id=result.get("id", ""),
-                        dataset=dataset,
-                        caption=result.get("caption", ""),
-                        score=float(result.get("score", 0.0)),
-                        match=bool(result.get("match", False)),
-                        **entity_props
-                    )
-                    matches.append(match_entity)
-                
-                # Log match results
-                if matches:
-                    top_match = max(matches, key=lambda m: m.score)
-                    audit_logger.log_matches_found(
-                        request_id=request_id,
-                        dataset=dataset,
-                        match_count=len(matches),
-                        top_score=top_match.score,
-                        top_entity_id=top_match.entity_id
-                    )
-                else:
-                    audit_logger.log_matches_found(
-                        request_id=request_id,
-                        dataset=dataset,
-                        match_count=0,
-                        top_score=0.0
-                    )
-                
-                return matches
+                matches.append(match_entity)
+            
+            return matches
         
         except httpx.TimeoutException:
+            self._mark_unhealthy("Yente service timeout")
             audit_logger.log_error(
                 request_id=request_id,
                 error_type="yente_timeout",
                 error_message=f"Timeout querying {dataset}",
                 dataset=dataset
             )
-            return matches
+            return None
         
         except Exception as e:
+            self._mark_unhealthy(f"Yente query failed: {str(e)}")
             audit_logger.log_error(
                 request_id=request_id,
                 error_type="yente_exception",
                 error_message=str(e),
                 dataset=dataset
             )
-            return matches
+            return None
+    
+    @staticmethod
+    def _serialize_query(query_payload: Dict[str, Any]) -> bytes:
+        """Serialize a Yente query canonically (sorted keys) so equal queries share a cache key"""
+        return orjson.dumps(query_payload, option=orjson.OPT_SORT_KEYS)
+    
+    async def screen_against_dataset(
+        self,
+        dataset: str,
+        request_id: str,
+        query_payload: Dict[str, Any],
+        query_bytes: Optional[bytes] = None
+    ) -> Optional[List[MatchedEntity]]:
+        """
+        Screen person against a specific sanctions dataset
+        
+        Successful results are cached for YENTE_CACHE_TTL seconds, so repeat
+        screenings of the same person (registration, withdrawal, rescans) skip
+        the Yente round-trip. Concurrent identical queries share one request.
+        
+        Args:
+            query_payload: Yente query built by _build_yente_query
+            query_bytes: Pre-serialized query_payload (see _serialize_query),
+                shared across datasets
+        
+        Returns:
+            List of matched entities with scores, or None if the query failed
+        """
+        if query_bytes is None:
+            query_bytes = self._serialize_query(query_payload)
+        
+        cache_key = (dataset, hashlib.sha256(query_bytes).digest())
+        matches = self._match_cache.get(cache_key)
+        cache_hit = matches is not None
+        
+        if not cache_hit:
+            lock = self._match_locks.setdefault(cache_key, asyncio.Lock())
+            try:
+                async with lock:
+                    # An identical query may have filled the cache while we waited
+                    matches = self._match_cache.get(cache_key)
+                    cache_hit = matches is not None
+                    
+                    if not cache_hit:
+                        matches = await self._query_dataset(
+                            dataset, request_id, query_payload, query_bytes
+                        )
+                        if matches is None:
+                            # Failures are not cached so the next request retries
+                            return None
+                        self._match_cache[cache_key] = matches
+            finally:
+                if not lock.locked():
+                    self._match_locks.pop(cache_key, None)
+        
+        if cache_hit:
+            audit_logger.log_yente_query(
+                request_id=request_id,
+                dataset=dataset,
+                query_payload=query_payload,
+                response_status=200,
+                response_time_ms=0.0,
+                cache_hit=True
+            )
+        
+        self._log_matches(request_id, dataset, matches)
+        
+        return list(matches)
     
     async def screen_all_datasets(
         self,
         request: PersonScreeningRequest,
         request_id: str
-    ) -> List[MatchedEntity]:
+    ) -> Tuple[List[MatchedEntity], List[str]]:
         """
         Screen person against all configured datasets
         
         Returns:
-            Combined list of all matches across datasets
+            Tuple of (combined unsorted matches, datasets that could not be
+            queried). Callers must not make a decision when any dataset failed:
+            missing results would read as "no match".
         """
         all_matches: List[MatchedEntity] = []
+        failed_datasets: List[str] = []
         
-        for dataset in settings.DATASETS:
-            dataset_matches = await self.screen_against_dataset(
-                request=request,
-                dataset=dataset,
-                request_id=request_id
-            )
-            all_matches.extend(dataset_matches)
+        # Build and serialize the query once; it is identical for every dataset
+        query_payload = self._build_yente_query(request)
+        query_bytes = self._serialize_query(query_payload)
         
-        # Sort by score (descending)
-        all_matches.sort(key=lambda m: m.score, reverse=True)
+        # Query all datasets concurrently (latency = slowest dataset, not the sum)
+        results = await asyncio.gather(
+            *[
+                self.screen_against_dataset(
+                    dataset=dataset,
+                    request_id=request_id,
+                    query_payload=query_payload,
+                    query_bytes=query_bytes
+                )
+                for dataset in settings.DATASETS
+            ],
+            return_exceptions=True
+        )
+        
+        for dataset, result in zip(settings.DATASETS, results):
+            if isinstance(result, BaseException):
+                self._mark_unhealthy(f"Yente query failed: {str(result)}")
+                audit_logger.log_error(
+                    request_id=request_id,
+                    error_type="yente_exception",
+                    error_message=str(result),
+                    dataset=dataset
+                )
+                failed_datasets.append(dataset)
+                continue
+            if result is None:
+                # Query failed (already logged by _query_dataset)
+                failed_datasets.append(dataset)
+                continue
+            all_matches.extend(result)
         
-        return all_matches
+        return all_matches, failed_datasets
 
 
 # Global Yente client instance
@@ -2,37 +2,49 @@
 Test script for Sanctions Screening API
 Run this after starting the API to verify everything works
 """
-import requests
+import asyncio
+import httpx
 import json
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 
 API_BASE_URL = "http://localhost:8080"
 
+# Repeat lookups are served from the API's Yente result cache
+CACHED_TARGET_MS = 10
+
+# (test name, passed, printable output)
+TestResult = Tuple[str, bool, str]
+
+
+def format_header(text: str) -> str:
+    """Format header"""
+    return f"\n{'='*70}\n  {text}\n{'='*70}\n"
+
 
 def print_header(text: str):
     """Print formatted header"""
-    print(f"\n{'='*70}")
-    print(f"  {text}")
-    print(f"{'='*70}\n")
+    print(format_header(text))
 
 
-def print_result(test_name: str, passed: bool, details: str = ""):
-    """Print test result"""
+def format_result(test_name: str, passed: bool, details: str = "") -> str:
+    """Format test result"""
     status = "PASS" if passed else "FAIL"
     symbol = "✓" if passed else "✗"
-    print(f"{symbol} {test_name}: {status}")
+    result = f"{symbol} {test_name}: {status}"
     if details:
-        print(f"  {details}")
+        result += f"\n  {details}"
+    return result
 
 
-def test_health_check() -> bool:
+async def test_health_check(client: httpx.AsyncClient) -> TestResult:
     """Test health check endpoint"""
-    print_header("Test 1: Health Check")
+    name = "Health Check"
+    out: List[str] = [format_header("Test 1: Health Check")]
     
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = await client.get("/health", timeout=5)
         data = response.json()
         
         passed = (
@@ -41,19 +53,20 @@ def test_health_check() -> bool:
             data.get("yente_status") is not None
         )
         
-        print(f"Response: {json.dumps(data, indent=2)}")
-        print_result("Health Check", passed, f"Status: {data.get('status')}")
+        out.append(f"Response: {json.dumps(data, indent=2)}")
+        out.append(format_result(name, passed, f"Status: {data.get('status')}"))
         
-        return passed
+        return name, passed, "\n".join(out)
     
     except Exception as e:
-        print_result("Health Check", False, f"Error: {str(e)}")
-        return False
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
 
 
-def test_clear_case() -> bool:
+async def test_clear_case(client: httpx.AsyncClient) -> TestResult:
     """Test screening a clean person (should return clear)"""
-    print_header("Test 2: Clear Decision (Clean Person)")
+    name = "Clear Decision"
+    out: List[str] = [format_header("Test 2: Clear Decision (Clean Person)")]
     
     payload = {
         "full_name": "Jane Elizabeth Smith",
@@ -62,10 +75,9 @@ def test_clear_case() -> bool:
     }
     
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/v1/sanctions/screen/person",
-            json=payload,
-            timeout=15
+        response = await client.post(
+            "/v1/sanctions/screen/person",
+            json=payload
         )
         
         data = response.json()
@@ -75,25 +87,26 @@ def test_clear_case() -> bool:
             data.get("decision") == "clear"
         )
         
-        print(f"Request: {json.dumps(payload, indent=2)}")
-        print(f"\nResponse Summary:")
-        print(f"  Decision: {data.get('decision')}")
-        print(f"  Risk Level: {data.get('risk_level')}")
-        print(f"  Top Score: {data.get('top_score')}")
-        print(f"  Matches Found: {len(data.get('matches', []))}")
+        out.append(f"Request: {json.dumps(payload, indent=2)}")
+        out.append(f"\nResponse Summary:")
+        out.append(f"  Decision: {data.get('decision')}")
+        out.append(f"  Risk Level: {data.get('risk_level')}")
+        out.append(f"  Top Score: {data.get('top_score')}")
+        out.append(f"  Matches Found: {len(data.get('matches', []))}")
         
-        print_result("Clear Decision", passed)
+        out.append(format_result(name, passed))
         
-        return passed
+        return name, passed, "\n".join(out)
     
     except Exception as e:
-        print_result("Clear Decision", False, f"Error: {str(e)}")
-        return False
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
 
 
-def test_block_case() -> bool:
+async def test_block_case(client: httpx.AsyncClient) -> TestResult:
     """Test screening a known sanctioned person (should return block)"""
-    print_header("Test 3: Block Decision (Known Sanctions Target)")
+    name = "Block Decision"
+    out: List[str] = [format_header("Test 3: Block Decision (Known Sanctions Target)")]
     
     payload = {
         "full_name": "Hassan Nasrallah",
@@ -104,10 +117,9 @@ def test_block_case() -> bool:
     }
     
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/v1/sanctions/screen/person",
-            json=payload,
-            timeout=15
+        response = await client.post(
+            "/v1/sanctions/screen/person",
+            json=payload
         )
         
         data = response.json()
@@ -119,72 +131,73 @@ def test_block_case() -> bool:
             data.get("top_score", 0) > 0.70
         )
         
-        print(f"Request: {json.dumps(payload, indent=2)}")
-        print(f"\nResponse Summary:")
-        print(f"  Decision: {data.get('decision')}")
-        print(f"  Risk Level: {data.get('risk_level')}")
-        print(f"  Top Score: {data.get('top_score')}")
-        print(f"  Matches Found: {len(data.get('matches', []))}")
+        out.append(f"Request: {json.dumps(payload, indent=2)}")
+        out.append(f"\nResponse Summary:")
+        out.append(f"  Decision: {data.get('decision')}")
+        out.append(f"  Risk Level: {data.get('risk_level')}")
+        out.append(f"  Top Score: {data.get('top_score')}")
+        out.append(f"  Matches Found: {len(data.get('matches', []))}")
         
         if data.get('matches'):
             top_match = data['matches'][0]
-            print(f"\nTop Match:")
-            print(f"  Entity: {top_match.get('caption')}")
-            print(f"  Dataset: {top_match.get('dataset')}")
-            print(f"  Score: {top_match.get('score')}")
-            print(f"  Programs: {', '.join(top_match.get('programs', []))}")
+            out.append(f"\nTop Match:")
+            out.append(f"  Entity: {top_match.get('caption')}")
+            out.append(f"  Dataset: {top_match.get('dataset')}")
+            out.append(f"  Score: {top_match.get('score')}")
+            out.append(f"  Programs: {', '.join(top_match.get('programs', []))}")
         
-        print(f"\nReasons:")
+        out.append(f"\nReasons:")
         for reason in data.get('reasons', [])[:3]:
-            print(f"  - {reason}")
+            out.append(f"  - {reason}")
         
-        print_result("Block Decision", passed, 
-                    f"Expected block/review with high score, got: {data.get('decision')}")
+        out.append(format_result(name, passed,
+                                 f"Expected block/review with high score, got: {data.get('decision')}"))
         
-        return passed
+        return name, passed, "\n".join(out)
     
     except Exception as e:
-        print_result("Block Decision", False, f"Error: {str(e)}")
-        return False
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
 
 
-def test_minimal_request() -> bool:
+async def test_minimal_request(client: httpx.AsyncClient) -> TestResult:
     """Test with minimal data (name only)"""
-    print_header("Test 4: Minimal Request (Name Only)")
+    name = "Minimal Request"
+    out: List[str] = [format_header("Test 4: Minimal Request (Name Only)")]
     
     payload = {
         "full_name": "John Doe"
     }
     
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/v1/sanctions/screen/person",
-            json=payload,
-            timeout=15
+        response = await client.post(
+            "/v1/sanctions/screen/person",
+            json=payload
         )
         
         data = response.json()
         
         passed = response.status_code == 200
         
-        print(f"Request: {json.dumps(payload, indent=2)}")
-        print(f"\nResponse Summary:")
-        print(f"  Decision: {data.get('decision')}")
-        print(f"  Top Score: {data.get('top_score')}")
-        print(f"  Matches Found: {len(data.get('matches', []))}")
+        out.append(f"Request: {json.dumps(payload, indent=2)}")
+        out.append(f"\nResponse Summary:")
+        out.append(f"  Decision: {data.get('decision')}")
+        out.append(f"  Top Score: {data.get('top_score')}")
+        out.append(f"  Matches Found: {len(data.get('matches', []))}")
         
-        print_result("Minimal Request", passed)
+        out.append(format_result(name, passed))
         
-        return passed
+        return name, passed, "\n".join(out)
     
     except Exception as e:
-        print_result("Minimal Request", False, f"Error: {str(e)}")
-        return False
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
 
 
-def test_request_id_tracking() -> bool:
+async def test_request_id_tracking(client: httpx.AsyncClient) -> TestResult:
     """Test that request IDs are properly generated and returned"""
-    print_header("Test 5: Request ID Tracking")
+    name = "Request ID Tracking"
+    out: List[str] = [format_header("Test 5: Request ID Tracking")]
     
     custom_request_id = "test_request_12345"
     
@@ -194,10 +207,9 @@ def test_request_id_tracking() -> bool:
     }
     
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/v1/sanctions/screen/person",
-            json=payload,
-            timeout=15
+        response = await client.post(
+            "/v1/sanctions/screen/person",
+            json=payload
         )
         
         data = response.json()
@@ -207,21 +219,22 @@ def test_request_id_tracking() -> bool:
             data.get("request_id") == custom_request_id
         )
         
-        print(f"Custom Request ID: {custom_request_id}")
-        print(f"Returned Request ID: {data.get('request_id')}")
+        out.append(f"Custom Request ID: {custom_request_id}")
+        out.append(f"Returned Request ID: {data.get('request_id')}")
         
-        print_result("Request ID Tracking", passed)
+        out.append(format_result(name, passed))
         
-        return passed
+        return name, passed, "\n".join(out)
     
     except Exception as e:
-        print_result("Request ID Tracking", False, f"Error: {str(e)}")
-        return False
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
 
 
-def test_performance() -> bool:
+async def test_performance(client: httpx.AsyncClient) -> TestResult:
     """Test API response time"""
-    print_header("Test 6: Performance Check")
+    name = "Performance Check"
+    out: List[str] = [format_header("Test 6: Performance Check")]
     
     payload = {
         "full_name": "Performance Test User",
@@ -229,35 +242,126 @@ def test_performance() -> bool:
     }
     
     try:
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        response = requests.post(
-            f"{API_BASE_URL}/v1/sanctions/screen/person",
-            json=payload,
-            timeout=15
+        response = await client.post(
+            "/v1/sanctions/screen/person",
+            json=payload
         )
         
-        elapsed_time = (time.time() - start_time) * 1000  # Convert to ms
+        elapsed_time = (time.perf_counter_ns() - start_time) / 1e6  # Convert to ms
         
         data = response.json()
         
+        # Same payload again: should be answered from the result cache
+        start_time = time.perf_counter_ns()
+        
+        repeat_response = await client.post(
+            "/v1/sanctions/screen/person",
+            json=payload
+        )
+        
+        repeat_time = (time.perf_counter_ns() - start_time) / 1e6
+        
         # Should complete in under 5 seconds for single request
         passed = (
             response.status_code == 200 and
-            elapsed_time < 5000
+            elapsed_time < 5000 and
+            repeat_response.status_code == 200 and
+            repeat_time < CACHED_TARGET_MS
+        )
+        
+        out.append(f"Response Time: {elapsed_time:.2f} ms")
+        out.append(f"Repeat Response Time: {repeat_time:.2f} ms")
+        out.append(f"Datasets Checked: {', '.join(data.get('datasets_checked', []))}")
+        
+        out.append(format_result(name, passed,
+                                 f"Target: <5000ms (repeat <{CACHED_TARGET_MS}ms), "
+                                 f"Actual: {elapsed_time:.2f}ms (repeat {repeat_time:.2f}ms)"))
+        
+        return name, passed, "\n".join(out)
+    
+    except Exception as e:
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
+
+
+async def test_batch_case(client: httpx.AsyncClient) -> TestResult:
+    """Test batch screening (one round-trip, results in request order)"""
+    name = "Batch Screening"
+    out: List[str] = [format_header("Test 7: Batch Screening")]
+    
+    payload = {
+        "requests": [
+            {"full_name": "Jane Elizabeth Smith", "country": "US", "date_of_birth": "1990-05-15"},
+            {"full_name": "Hassan Nasrallah", "country": "LB", "date_of_birth": "1960-08-31"},
+            {"full_name": "John Doe"},
+            {"full_name": "Test Person", "request_id": "test_batch_12345"},
+            {"full_name": "Performance Test User", "country": "US"}
+        ]
+    }
+    
+    try:
+        response = await client.post(
+            "/v1/sanctions/screen/person/batch",
+            json=payload
+        )
+        
+        data = response.json()
+        results = data.get("results", [])
+        decisions = [result.get("decision") for result in results]
+        
+        passed = (
+            response.status_code == 200 and
+            len(results) == len(payload["requests"]) and
+            decisions[0] == "clear" and
+            decisions[1] in ["block", "review"] and
+            results[3].get("request_id") == "test_batch_12345"
         )
         
-        print(f"Response Time: {elapsed_time:.2f} ms")
-        print(f"Datasets Checked: {', '.join(data.get('datasets_checked', []))}")
+        out.append(f"Requests Sent: {len(payload['requests'])}")
+        out.append(f"Results Returned: {len(results)}")
+        for request, result in zip(payload["requests"], results):
+            out.append(f"  {request['full_name']}: {result.get('decision')} "
+                       f"(top score {result.get('top_score')})")
         
-        print_result("Performance Check", passed, 
-                    f"Target: <5000ms, Actual: {elapsed_time:.2f}ms")
+        out.append(format_result(name, passed,
+                                 f"Expected clear, block/review, ..., got: {decisions}"))
         
-        return passed
+        return name, passed, "\n".join(out)
     
     except Exception as e:
-        print_result("Performance Check", False, f"Error: {str(e)}")
-        return False
+        out.append(format_result(name, False, f"Error: {str(e)}"))
+        return name, False, "\n".join(out)
+
+
+ALL_TESTS = [
+    test_health_check,
+    test_clear_case,
+    test_block_case,
+    test_minimal_request,
+    test_request_id_tracking,
+    test_performance,
+    test_batch_case,
+]
+
+
+async def run_tests_concurrently() -> List[TestResult]:
+    """Run ALL_TESTS concurrently on a shared pooled client"""
+    # One keep-alive connection per concurrent test, never more; requests wait
+    # for a free connection instead of opening new ones. No retries, so a slow
+    # or failing API shows up as such rather than as retry backoff.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=len(ALL_TESTS),
+            max_keepalive_connections=len(ALL_TESTS)
+        ),
+        retries=0
+    )
+    
+    async with httpx.AsyncClient(base_url=API_BASE_URL, transport=transport, timeout=15) as client:
+        return await asyncio.gather(*[test(client) for test in ALL_TESTS])
 
 
 def run_all_tests():
@@ -268,25 +372,14 @@ def run_all_tests():
     
     input("\nPress Enter to start tests...")
     
-    # Run all tests
-    results = []
-    
-    results.append(("Health Check", test_health_check()))
-    time.sleep(1)
-    
-    results.append(("Clear Decision", test_clear_case()))
-    time.sleep(1)
+    # Tests are independent, so run them concurrently over one shared client
+    completed = asyncio.run(run_tests_concurrently())
     
-    results.append(("Block Decision", test_block_case()))
-    time.sleep(1)
-    
-    results.append(("Minimal Request", test_minimal_request()))
-    time.sleep(1)
-    
-    results.append(("Request ID Tracking", test_request_id_tracking()))
-    time.sleep(1)
-    
-    results.append(("Performance Check", test_performance()))
+    # gather() preserves declaration order, so the report is deterministic
+    results = []
+    for test_name, passed, output in completed:
+        print(output)
+        results.append((test_name, passed))
     
     # Print summary
     print_header("TEST SUMMARY")
@@ -2,75 +2,255 @@
 Audit logging system for sanctions screening
 Maintains immutable audit trail for regulatory compliance
 """
-import json
+import atexit
 import logging
-from datetime import datetime
+import queue
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
-from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 
-from config import settings, AUDIT_LOG_DIR
+import orjson
+
+from config import settings, get_audit_log_dir
+
+
+# Screening errors are also reported through regular logging (stderr by default)
+error_logger = logging.getLogger("sanctions_api")
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize an audit entry to a JSON line"""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") reused within the same second
+_iso_second_cache = (-1, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO 8601 with microseconds, without a datetime object"""
+    global _iso_second_cache
+    t = time.time()
+    second = int(t)
+    cached_second, prefix = _iso_second_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second_cache = (second, prefix)
+    return f"{prefix}.{int((t - second) * 1e6):06d}Z"
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue records untouched so formatting happens on the listener thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _JsonFormatter(logging.Formatter):
+    """
+    Serialize the structured log entry carried in record.msg
+    
+    Entries stay plain dicts encoded in a single orjson pass; per-event string
+    templates with individually escaped values benchmarked ~3x slower.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        return _dumps(record.msg)
+
+
+class _AuditFileHandler(TimedRotatingFileHandler):
+    """Daily rotating audit file that also accepts raw JSON lines"""
+    
+    def write_lines(self, lines: List[str]):
+        """Append serialized entries in one write, rolling the file over first if due"""
+        self.acquire()
+        try:
+            # Time-based rollover does not inspect the record
+            if self.shouldRollover(None):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        finally:
+            self.release()
+
+
+class _AuditQueueListener(QueueListener):
+    """
+    Writes raw audit entries directly; LogRecords take the normal handler path
+    
+    Entries are serialized as they arrive and written in groups: once
+    LOG_BATCH_MAX_LINES lines are pending, or LOG_BATCH_INTERVAL_MS after the
+    oldest pending line, whichever comes first. A crash can lose at most that
+    window; stop() writes everything still pending.
+    """
+    
+    def _monitor(self):
+        q = self.queue
+        max_lines = settings.LOG_BATCH_MAX_LINES
+        interval = settings.LOG_BATCH_INTERVAL_MS / 1000
+        pending: List[str] = []
+        deadline = 0.0
+        
+        while True:
+            try:
+                if pending:
+                    entry = q.get(timeout=max(deadline - time.monotonic(), 0))
+                else:
+                    entry = q.get()
+            except queue.Empty:
+                # Oldest pending line is due
+                self._write_pending(pending)
+                continue
+            
+            if entry is self._sentinel:
+                q.task_done()
+                break
+            
+            if isinstance(entry, logging.LogRecord):
+                # Keep file order: pending entries were queued first
+                self._write_pending(pending)
+                self.handle(entry)
+            else:
+                try:
+                    pending.append(_dumps(entry))
+                except Exception:
+                    error_logger.exception("Failed to serialize audit entry")
+                if len(pending) == 1:
+                    deadline = time.monotonic() + interval
+            q.task_done()
+            
+            if len(pending) >= max_lines or (pending and time.monotonic() >= deadline):
+                self._write_pending(pending)
+        
+        self._write_pending(pending)
+    
+    def _write_pending(self, pending: List[str]):
+        """Write and clear buffered lines"""
+        if not pending:
+            return
+        try:
+            self.handlers[0].write_lines(pending)
+        except Exception:
+            error_logger.exception("Failed to write %d audit entries", len(pending))
+        pending.clear()
 
 
 class AuditLogger:
-    """Structured audit logger for screening events"""
+    """
+    Structured audit logger for screening events
+    
+    Log calls only enqueue the entry dict (no LogRecord or Formatter); a
+    listener thread serializes it and writes batches of lines straight to the
+    rotating file, keeping disk writes off the event loop. The listener
+    is started once when the logger is configured and drained by stop() (API
+    shutdown) or at interpreter exit.
+    
+    Raising the "sanctions_audit" logger's level (e.g. for benchmarks or local
+    development) skips building and serializing entries altogether; errors are
+    still audited unless the level is above ERROR.
+    """
     
     def __init__(self):
         self.logger = self._setup_logger()
     
     def _setup_logger(self) -> logging.Logger:
-        """Configure audit logger with rotation"""
+        """Configure audit logger with rotation behind a queue (once per process)"""
         logger = logging.getLogger("sanctions_audit")
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
         
-        # Clear existing handlers
-        logger.handlers.clear()
+        # Already configured (module re-imported by a reloader or test runner):
+        # share that instance's queue, file handle and writer thread instead of
+        # opening another file descriptor and writing every entry twice
+        configured = getattr(logger, "_audit_configured", None)
+        if configured is not None:
+            self.__dict__ = configured.__dict__
+            return logger
         
-        # Daily rotating file handler
-        log_file = AUDIT_LOG_DIR / f"screening_{datetime.utcnow().strftime('%Y%m%d')}.log"
+        self._queue: queue.Queue = queue.Queue(-1)
+        self._listener: Optional[QueueListener] = None
         
-        handler = RotatingFileHandler(
-            filename=str(log_file),
-            maxBytes=settings.LOG_MAX_SIZE_MB * 1024 * 1024,
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        
+        # Daily rotating file handler (rolls over at midnight UTC while running)
+        handler = _AuditFileHandler(
+            filename=str(get_audit_log_dir() / "screening.log"),
+            when="midnight",
+            utc=True,
             backupCount=settings.LOG_RETENTION_DAYS,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True
         )
         
-        # JSON formatter for structured logs
-        formatter = logging.Formatter(
-            '%(message)s'
-        )
-        handler.setFormatter(formatter)
+        # JSON formatter for records sent through self.logger directly
+        handler.setFormatter(_JsonFormatter())
+        self._file_handler = handler
+        
+        logger.addHandler(_DeferredQueueHandler(self._queue))
         
-        logger.addHandler(handler)
+        # Single writer thread for the process
+        self.start()
+        atexit.register(self.stop)
         
+        logger._audit_configured = self
         return logger
     
+    def start(self):
+        """Start the background writer thread (no-op if already running)"""
+        if self._listener is None:
+            self._listener = _AuditQueueListener(
+                self._queue,
+                self._file_handler,
+                respect_handler_level=True
+            )
+            self._listener.start()
+    
+    def stop(self):
+        """Flush queued audit records and stop the writer thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            self._file_handler.flush()
+    
+    def _write(self, entry: Dict[str, Any]):
+        """Hand an audit entry to the writer thread"""
+        self._queue.put_nowait(entry)
+    
     def log_screening_request(
         self,
         request_id: str,
-        request_data: Dict[str, Any],
+        full_name: str,
+        country: Optional[str] = None,
+        has_dob: bool = False,
+        has_passport: bool = False,
+        has_national_id: bool = False,
         user_id: Optional[str] = None,
         context: Optional[str] = None
     ):
         """Log incoming screening request"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         log_entry = {
             "event_type": "screening_request",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "request_id": request_id,
             "user_id": user_id,
             "context": context,
             "request_data": {
-                "full_name": request_data.get("full_name"),
-                "country": request_data.get("country"),
-                "has_dob": bool(request_data.get("date_of_birth")),
-                "has_passport": bool(request_data.get("passport_number")),
-                "has_national_id": bool(request_data.get("national_id"))
+                "full_name": full_name,
+                "country": country,
+                "has_dob": has_dob,
+                "has_passport": has_passport,
+                "has_national_id": has_national_id
             }
         }
         
-        self.logger.info(json.dumps(log_entry, ensure_ascii=False))
+        self._write(log_entry)
     
     def log_yente_query(
         self,
@@ -78,20 +258,30 @@ class AuditLogger:
         dataset: str,
         query_payload: Dict[str, Any],
         response_status: int,
-        response_time_ms: float
+        response_time_ms: float,
+        cache_hit: bool = False
     ):
         """Log Yente API interaction"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        try:
+            query_fields = list(query_payload["queries"]["q1"]["properties"])
+        except (KeyError, TypeError):
+            query_fields = []
+        
         log_entry = {
             "event_type": "yente_query",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "request_id": request_id,
             "dataset": dataset,
-            "query_fields": list(query_payload.get("queries", {}).get("q1", {}).get("properties", {}).keys()),
+            "query_fields": query_fields,
             "response_status": response_status,
-            "response_time_ms": round(response_time_ms, 2)
+            "response_time_ms": round(response_time_ms, 2),
+            "cache_hit": cache_hit
         }
         
-        self.logger.info(json.dumps(log_entry, ensure_ascii=False))
+        self._write(log_entry)
     
     def log_matches_found(
         self,
@@ -102,9 +292,12 @@ class AuditLogger:
         top_entity_id: Optional[str] = None
     ):
         """Log match results from Yente"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         log_entry = {
             "event_type": "matches_found",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "request_id": request_id,
             "dataset": dataset,
             "match_count": match_count,
@@ -112,7 +305,7 @@ class AuditLogger:
             "top_entity_id": top_entity_id
         }
         
-        self.logger.info(json.dumps(log_entry, ensure_ascii=False))
+        self._write(log_entry)
     
     def log_decision(
         self,
@@ -126,9 +319,12 @@ class AuditLogger:
         context: Optional[str] = None
     ):
         """Log final screening decision"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         log_entry = {
             "event_type": "screening_decision",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "request_id": request_id,
             "user_id": user_id,
             "context": context,
@@ -139,7 +335,7 @@ class AuditLogger:
             "reasons": reasons
         }
         
-        self.logger.info(json.dumps(log_entry, ensure_ascii=False))
+        self._write(log_entry)
     
     def log_error(
         self,
@@ -149,16 +345,21 @@ class AuditLogger:
         dataset: Optional[str] = None
     ):
         """Log error events"""
-        log_entry = {
-            "event_type": "screening_error",
-            "timestamp": datetime.utcnow().isoformat(),
-            "request_id": request_id,
-            "error_type": error_type,
-            "error_message": error_message,
-            "dataset": dataset
-        }
+        if self.logger.isEnabledFor(logging.ERROR):
+            log_entry = {
+                "event_type": "screening_error",
+                "timestamp": _now_iso(),
+                "request_id": request_id,
+                "error_type": error_type,
+                "error_message": error_message,
+                "dataset": dataset
+            }
+            
+            self._write(log_entry)
         
-        self.logger.error(json.dumps(log_entry, ensure_ascii=False))
+        error_logger.error(
+            "Screening error [%s] %s: %s", request_id, error_type, error_message
+        )
 
 
 # Global audit logger instance